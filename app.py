@@ -1,16 +1,31 @@
 import os
 import sys
 import json
-from functools import wraps
+import hashlib
+import threading
+from collections import namedtuple
+from functools import lru_cache, wraps
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from time import monotonic, sleep, time_ns
+from time import time as unix_time  # Aliased: 'time' is a common local name (event form fields)
 
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, render_template, request, redirect, url_for, flash, g, session, jsonify, make_response
 from flask_login import LoginManager, UserMixin, login_user, logout_user, current_user, login_required
 from werkzeug.security import generate_password_hash, check_password_hash
+from jinja2 import FileSystemBytecodeCache
+from flask.json.provider import DefaultJSONProvider
+from flask_caching import Cache
 
-# Import the MySQL extension
-from flask_mysqldb import MySQL
-import MySQLdb.cursors
+try:
+    import orjson  # Optional: C/SIMD JSON encoder for API responses
+except ImportError:
+    orjson = None
+
+# MySQL driver with built-in connection pooling
+from mysql.connector import errors as mysql_errors, pooling
 
 # --- 1. Setup ---
 app = Flask(__name__)
@@ -18,15 +33,70 @@ app = Flask(__name__)
 # CRUCIAL: Set a strong secret key using environment variables in production
 app.config['SECRET_KEY'] = os.environ.get('FLASK_SECRET_KEY', 'your_super_secret_key_here')
 
+# Development mode is opt-in (FLASK_DEBUG=1); everything else is treated as production
+DEBUG_MODE = os.environ.get('FLASK_DEBUG', '0') == '1'
+
+# --- JSON ENCODING ---
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes with orjson; types orjson lacks (e.g. Decimal prices) use Flask's default.
+    Only the compact (jsonify, session cookie) and indent=2 (debug jsonify) outputs map onto orjson
+    options; any other dumps() arguments, and all decoding (the session serializer passes an
+    object_hook), go through Flask's default provider.
+    """
+
+    def dumps(self, obj, **kwargs):
+        if kwargs.get('indent') not in (None, 2) or kwargs.get('separators', (',', ':')) != (',', ':') \
+                or kwargs.keys() - {'indent', 'separators', 'sort_keys'}:
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get('indent') == 2:
+            option |= orjson.OPT_INDENT_2
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+# --- TEMPLATE & STATIC CACHING ---
+if not DEBUG_MODE:
+    # Compile each template once and reuse the bytecode across workers and restarts
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
+    app.jinja_env.auto_reload = False
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache()
+    # Let browsers cache static/style.css and static/script.js instead of revalidating every page load
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = timedelta(hours=12)
+
 # --- MYSQL CONFIGURATION ---
 # IMPORTANT: Replace these values with your actual MySQL server details.
 app.config['MYSQL_HOST'] = 'localhost'
 app.config['MYSQL_USER'] = 'root'
 app.config['MYSQL_PASSWORD'] = ''  # Enter your MySQL password here
 app.config['MYSQL_DB'] = 'enova_pro_db'
-app.config['MYSQL_CURSORCLASS'] = 'DictCursor'  # Returns rows as dictionaries
+app.config['MYSQL_POOL_SIZE'] = int(os.environ.get('MYSQL_POOL_SIZE', 10))  # Connections kept open per process (see gunicorn_conf.py)
+app.config['MYSQL_POOL_TIMEOUT'] = 5  # Seconds a request waits for a free pooled connection
+
+# --- PASSWORD HASHING ---
+# One cost setting for every hash the app writes (werkzeug's scrypt defaults, pinned so they
+# only change deliberately). Stored hashes with other parameters are rehashed at login.
+PASSWORD_HASH_METHOD = 'scrypt:32768:8:1'
+
+# Password hashing is CPU-bound and releases the GIL inside hashlib, so it runs on real
+# worker threads. Note: gevent's monkey.patch_all() also patches threading, which turns
+# these threads into greenlets; under gevent workers use gevent's native threadpool instead.
+_hash_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='pwhash')
 
-mysql = MySQL(app)
+
+def hash_password(password):
+    """Hashes a password with PASSWORD_HASH_METHOD on the hashing thread pool."""
+    return _hash_executor.submit(generate_password_hash, password, method=PASSWORD_HASH_METHOD).result()
+
+
+# The pool is created lazily on first use so a down MySQL server does not crash the import.
+_db_pool = None
+_db_pool_lock = threading.Lock()
 # --- END MYSQL CONFIGURATION ---
 
 # FLASK-LOGIN SETUP
@@ -35,15 +105,114 @@ login_manager.init_app(app)
 login_manager.login_view = 'login'
 login_manager.login_message_category = 'warning'
 
+def get_code_release():
+    """
+    Identifies the deployed code: ENOVA_RELEASE if set (e.g. the git revision), otherwise a
+    digest of app.py and the templates, which every worker of one deploy computes identically.
+    """
+    release = os.environ.get('ENOVA_RELEASE')
+    if release:
+        return release
+    template_dir = os.path.join(app.root_path, 'templates')
+    paths = [__file__] + [os.path.join(template_dir, name) for name in sorted(os.listdir(template_dir))]
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+# Part of every cache key and page ETag, so a deploy never reuses page data or 304s from older code
+CODE_RELEASE = get_code_release()
+
+# QUERY RESULT CACHE
+# Page data is memoized under the current data version; every committed write bumps the
+# version, so stale entries are simply never read again and expire on their own.
+# This needs REDIS_URL, so that all workers share one cache and one version counter. A
+# per-process cache would only see that process's own writes, and under several gunicorn
+# workers would serve pages up to PAGE_CACHE_TIMEOUT old; without Redis, caching is off.
+SHARED_CACHE = bool(os.environ.get('REDIS_URL'))
+if SHARED_CACHE:
+    cache_config = {
+        'CACHE_TYPE': 'RedisCache',
+        'CACHE_REDIS_URL': os.environ['REDIS_URL'],
+        'CACHE_KEY_PREFIX': f'enova:{CODE_RELEASE}:',
+    }
+else:
+    cache_config = {'CACHE_TYPE': 'NullCache', 'CACHE_NO_NULL_WARNING': True}
+cache_config['CACHE_DEFAULT_TIMEOUT'] = 300
+cache = Cache(app, config=cache_config)
+PAGE_CACHE_TIMEOUT = 300  # seconds
+DATA_VERSION_KEY = 'data_version'
+
+
+def get_data_version():
+    """Returns the current data version that cached page data and page ETags are keyed on."""
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        # Start from a clock value rather than 0 so versions never repeat after the cache is
+        # emptied. A deploy starts a fresh version too, since CODE_RELEASE is in the key prefix.
+        cache.add(DATA_VERSION_KEY, time_ns(), timeout=0)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def not_modified(etag):
+    """
+    Returns an empty 304 response when the browser's copy of a page (If-None-Match) is
+    still current, otherwise None. Requests with pending flash messages always re-render.
+    Only used with a shared cache: a per-process version would not see other workers' writes,
+    so their 304s could keep a stale page alive indefinitely.
+    """
+    if not SHARED_CACHE or session.get('_flashes') or not request.if_none_match.contains(etag):
+        return None
+    response = make_response('', 304)
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def render_tagged(etag, template, **context):
+    """
+    Renders a per-user page tagged with an ETag so the next visit can be answered by not_modified().
+    Pages that display flash messages are not tagged, so a message never sticks to a cached copy,
+    and nothing is tagged without a shared cache (see not_modified()).
+    """
+    cacheable = SHARED_CACHE and not session.get('_flashes')
+    response = make_response(render_template(template, **context))
+    if cacheable:
+        response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def bump_data_version():
+    """
+    Moves to a new data version so every cached page is recomputed on its next request.
+    Runs after a commit, so a cache failure is logged rather than raised: the write itself succeeded.
+    """
+    try:
+        get_data_version()  # Ensure the clock-based starting value exists before incrementing
+        cache.cache.inc(DATA_VERSION_KEY)  # A single atomic INCR on Redis, so concurrent workers never lose a bump
+    except Exception as e:
+        print(f"Error bumping the cached data version: {e}")
+
 
 # --- Custom Decorators ---
 
 def admin_required(f):
-    """Decorator to restrict access to administrators only."""
+    """
+    Decorator to restrict access to administrators only.
+    Reads the logged-in user id and role stored in the signed session cookie at login, so
+    admin routes never need to resolve current_user (and possibly query the users table)
+    for the check.
+    """
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if not current_user.is_authenticated or current_user.role != 'admin':
+        if not session.get('_user_id') or session.get('role') != 'admin':
             flash('Access denied. Administrator privileges required.', 'danger')
             return redirect(url_for('login'))
         return f(*args, **kwargs)
@@ -53,20 +222,134 @@ def admin_required(f):
 
 # --- 2. Database Functions ---
 
-def init_db():
-    """Initializes the database tables (users, events, and bookings) using MySQL syntax."""
+def get_db_pool():
+    """Returns the shared MySQL connection pool, creating it on first use."""
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:  # Two threads racing here would otherwise each open a full pool
+            if _db_pool is None:
+                _db_pool = pooling.MySQLConnectionPool(
+                    pool_name='enova',
+                    pool_size=app.config['MYSQL_POOL_SIZE'],
+                    host=app.config['MYSQL_HOST'],
+                    user=app.config['MYSQL_USER'],
+                    password=app.config['MYSQL_PASSWORD'],
+                    database=app.config['MYSQL_DB'],
+                    autocommit=False
+                )
+    return _db_pool
+
+
+def get_db():
+    """
+    Returns the pooled connection for the current app context, checking one out if needed.
+    mysql-connector fails immediately when every pooled connection is in use, so wait up to
+    MYSQL_POOL_TIMEOUT seconds for one to be returned; the pool size caps load on MySQL.
+    """
+    if '_db' not in g:
+        pool = get_db_pool()
+        deadline = monotonic() + app.config['MYSQL_POOL_TIMEOUT']
+        while True:
+            try:
+                g._db = pool.get_connection()
+                break
+            except mysql_errors.PoolError:
+                if monotonic() >= deadline:
+                    raise
+                sleep(0.01)
+    return g._db
+
+
+@app.teardown_appcontext
+def release_db(exception):
+    """Returns the request's connection to the pool (close() on a pooled connection does not disconnect)."""
+    db = g.pop('_db', None)
+    if db is not None:
+        try:
+            # Resets the session (ending any open transaction) and hands the connection back,
+            # even when MySQL has already dropped it; that must not fail a finished request.
+            db.close()
+        except mysql_errors.Error as e:
+            print(f"Error returning database connection to the pool: {e}")
+
 
+@contextmanager
+def db_transaction():
+    """
+    Yields a cursor whose statements run as one transaction on the request's connection.
+    Commits when the block finishes (and invalidates cached page data), rolls back and
+    re-raises if it fails.
+    """
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     try:
-        conn = mysql.connection
-        cursor = conn.cursor()
-    except Exception as e:
-        print("-" * 60)
-        print("!!! CRITICAL ERROR: Could not get database connection for initialization. !!!")
-        print("Error details:", e)
-        print("Action required: Ensure the database 'enova_pro_db' exists in phpMyAdmin and server is running.")
-        print("-" * 60)
-        return
+        yield cursor
+        conn.commit()
+        bump_data_version()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def ensure_index(cursor, table, index_name, columns):
+    """Creates an index unless it already exists (MySQL has no CREATE INDEX IF NOT EXISTS)."""
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+        LIMIT 1
+        """,
+        (table, index_name)
+    )
+    if cursor.fetchone() is None:
+        cursor.execute(f'CREATE INDEX {index_name} ON {table} ({columns})')
+
+
+def column_exists(cursor, table, column):
+    """Checks information_schema for a column, so init_db can migrate tables created by older versions."""
+    cursor.execute(
+        """
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        LIMIT 1
+        """,
+        (table, column)
+    )
+    return cursor.fetchone() is not None
+
+
+def column_type(cursor, table, column):
+    """Returns a column's information_schema DATA_TYPE (e.g. 'varchar'), or None if it does not exist."""
+    cursor.execute(
+        """
+        SELECT DATA_TYPE AS data_type FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        LIMIT 1
+        """,
+        (table, column)
+    )
+    row = cursor.fetchone()
+    return row['data_type'].lower() if row else None
 
+
+def column_is_generated(cursor, table, column):
+    """Checks information_schema for whether a column is computed by MySQL (a generated column)."""
+    cursor.execute(
+        """
+        SELECT GENERATION_EXPRESSION AS expression FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+        LIMIT 1
+        """,
+        (table, column)
+    )
+    row = cursor.fetchone()
+    return bool(row and row['expression'])
+
+
+def create_schema(cursor):
+    """Creates or migrates the tables and indexes and seeds the admin user (run by init_db)."""
     # 1. Events Table (UPDATED to include 'price' for internal cost tracking)
     # NOTE: In production, use ALTER TABLE to add columns if table exists.
     # For simplicity in this development environment, this assumes the table is being created.
@@ -75,14 +358,19 @@ def init_db():
         CREATE TABLE IF NOT EXISTS events (
             id INT PRIMARY KEY AUTO_INCREMENT,
             title VARCHAR(100) NOT NULL,
-            date VARCHAR(50) NOT NULL,
-            time VARCHAR(50) NOT NULL,
+            date DATE NOT NULL,
+            time TIME NOT NULL,
             location VARCHAR(255) NOT NULL,
             description TEXT,
             price DECIMAL(10, 2) NOT NULL DEFAULT 0.00  -- NEW: Estimated internal cost
         )
     ''')
 
+    # Migrate events tables created when date/time were stored as VARCHAR strings. The form
+    # inputs always submitted 'YYYY-MM-DD' and 'HH:MM', which MySQL converts in place.
+    if column_type(cursor, 'events', 'date') == 'varchar':
+        cursor.execute('ALTER TABLE events MODIFY date DATE NOT NULL, MODIFY time TIME NOT NULL')
+
     # 2. Users Table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS users (
@@ -105,24 +393,105 @@ def init_db():
             budget VARCHAR(50),             
             base_price DECIMAL(10, 2),      
             addon_total DECIMAL(10, 2),     
-            total_estimated DECIMAL(10, 2), 
+            total_estimated DECIMAL(10, 2) AS (COALESCE(base_price, 0) + COALESCE(addon_total, 0)) STORED,
             vision TEXT,
             status VARCHAR(20) NOT NULL DEFAULT 'Pending',
-            FOREIGN KEY (user_id) REFERENCES users(id)
+            event_id INT NULL,  -- Scheduled event this booking matched at submission (by title)
+            is_pending TINYINT(1) AS (status = 'Pending') STORED,  -- Indexable "Pending first" sort key
+            FOREIGN KEY (user_id) REFERENCES users(id),
+            INDEX idx_bookings_event_id (event_id),
+            INDEX idx_bookings_pending_id (is_pending, id),
+            CONSTRAINT fk_bookings_event FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE SET NULL
         )
     ''')
 
+    # Migrate bookings tables created before event_id existed, linking old rows by title once
+    if not column_exists(cursor, 'bookings', 'event_id'):
+        cursor.execute('''
+            ALTER TABLE bookings
+                ADD COLUMN event_id INT NULL,
+                ADD INDEX idx_bookings_event_id (event_id),
+                ADD CONSTRAINT fk_bookings_event FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE SET NULL
+        ''')
+        cursor.execute('''
+            UPDATE bookings b
+            JOIN events e ON e.title = b.event_type
+            SET b.event_id = e.id
+        ''')
+
+    # Migrate bookings tables created before the admin list's pending-first sort key existed
+    if not column_exists(cursor, 'bookings', 'is_pending'):
+        cursor.execute('''
+            ALTER TABLE bookings
+                ADD COLUMN is_pending TINYINT(1) AS (status = 'Pending') STORED,
+                ADD INDEX idx_bookings_pending_id (is_pending, id)
+        ''')
+
+    # Migrate bookings tables where total_estimated was a plain column filled in by booking()
+    if not column_is_generated(cursor, 'bookings', 'total_estimated'):
+        cursor.execute('''
+            ALTER TABLE bookings
+                MODIFY total_estimated DECIMAL(10, 2) AS (COALESCE(base_price, 0) + COALESCE(addon_total, 0)) STORED
+        ''')
+
+    # 4. Indexes for hot lookups (users.username is already covered by its UNIQUE constraint)
+    ensure_index(cursor, 'events', 'idx_events_date_time', 'date, time')  # index/admin_dashboard ORDER BY
+    ensure_index(cursor, 'bookings', 'idx_bookings_status', 'status')  # Pending counts and filters
+
     # Seed an Admin user (username: 'admin', password: 'adminpass')
-    cursor.execute("SELECT id FROM users WHERE role='admin'")
+    # Only hash when the admin is actually missing; INSERT IGNORE keeps concurrent workers race-free.
+    cursor.execute("SELECT 1 FROM users WHERE role='admin' LIMIT 1")
     if not cursor.fetchone():
-        hashed_password = generate_password_hash('adminpass', method='pbkdf2:sha256')
+        hashed_password = hash_password('adminpass')
         cursor.execute(
-            'INSERT INTO users (username, password_hash, role) VALUES (%s, %s, %s)',
+            'INSERT IGNORE INTO users (username, password_hash, role) VALUES (%s, %s, %s)',
             ('admin', hashed_password, 'admin')
         )
 
-    conn.commit()
-    cursor.close()
+
+INIT_LOCK_TIMEOUT = 120  # Seconds a worker waits for another process's schema migration
+
+
+def init_db():
+    """
+    Initializes the database tables (users, events, and bookings) using MySQL syntax.
+    Takes a MySQL named lock first so that when several workers boot together only one
+    runs the DDL and seed. The others wait for it to finish and then skip it, so no worker
+    serves requests against a half-migrated schema.
+    """
+
+    try:
+        conn = get_db()
+        cursor = conn.cursor(dictionary=True)
+    except Exception as e:
+        print("-" * 60)
+        print("!!! CRITICAL ERROR: Could not get database connection for initialization. !!!")
+        print("Error details:", e)
+        print("Action required: Ensure the database 'enova_pro_db' exists in phpMyAdmin and server is running.")
+        print("-" * 60)
+        return
+
+    cursor.execute("SELECT GET_LOCK('enova_init', 0) AS acquired")
+    if not cursor.fetchone()['acquired']:
+        # Another process holds the lock: block until its DDL is done, then skip our own run
+        cursor.execute("SELECT GET_LOCK('enova_init', %s) AS acquired", (INIT_LOCK_TIMEOUT,))
+        acquired = cursor.fetchone()['acquired']
+        if acquired:
+            cursor.execute("SELECT RELEASE_LOCK('enova_init')")
+            cursor.fetchone()
+        cursor.close()
+        if not acquired:
+            raise RuntimeError(f"Database initialization did not finish within {INIT_LOCK_TIMEOUT}s in another process.")
+        print("Database initialized by another process; skipping.")
+        return
+
+    try:
+        create_schema(cursor)
+        conn.commit()
+    finally:
+        cursor.execute("SELECT RELEASE_LOCK('enova_init')")
+        cursor.fetchone()
+        cursor.close()
     print("MySQL tables created and Admin user seeded (admin/adminpass).")
 
 
@@ -145,22 +514,85 @@ class User(UserMixin):
         return f"User(id={self.id}, username='{self.username}', role='{self.role}')"
 
 
+# Recently loaded users, keyed by user ID: {user_id: (expires_at, (id, username, role))}
+USER_CACHE_TTL = 60  # seconds
+USER_CACHE_MAXSIZE = 1024
+_user_cache = {}
+
+
+def invalidate_cached_user(user_id):
+    """Drops a cached user so the next request reloads it from the database."""
+    _user_cache.pop(str(user_id), None)
+
+
+def cache_user(fields):
+    """Stores a user's (id, username, role) for USER_CACHE_TTL seconds and returns the User."""
+    if len(_user_cache) >= USER_CACHE_MAXSIZE:
+        _user_cache.clear()
+    _user_cache[str(fields[0])] = (monotonic() + USER_CACHE_TTL, fields)
+    return User(*fields)
+
+
 @login_manager.user_loader
 def load_user(user_id):
-    """Callback to reload the user object from the user ID stored in the session."""
+    """
+    Callback to reload the user object from the user ID stored in the session.
+    Rows are cached for USER_CACHE_TTL seconds so authenticated pages skip the users query.
+    """
+    key = str(user_id)
+    if not key.isdigit():
+        return None  # Junk ids from stale or tampered cookies can never match a row
+    cached = _user_cache.get(key)
+    if cached and cached[0] > monotonic():
+        return User(*cached[1])
+
     try:
-        cursor = mysql.connection.cursor()
+        cursor = get_db().cursor()
         cursor.execute('SELECT id, username, role FROM users WHERE id = %s', (user_id,))
         user_data = cursor.fetchone()
         cursor.close()
         if user_data:
-            return User(user_data['id'], user_data['username'], user_data['role'])
+            return cache_user(user_data)
         return None
     except Exception as e:
         print(f"ERROR in load_user: {e}")
         return None
 
 
+# Recent successful password checks: {sha256(password_hash:password): expires_at}
+PASSWORD_CACHE_TTL = 30  # seconds
+PASSWORD_CACHE_MAXSIZE = 1024
+_password_cache = {}
+
+def verify_password(password_hash, password):
+    """
+    Wraps check_password_hash with a short-lived cache of successful checks.
+    Only positive results are cached; failed attempts always pay the full hashing cost.
+    """
+    key = hashlib.sha256(f"{password_hash}:{password}".encode()).hexdigest()
+    expires_at = _password_cache.get(key)
+    if expires_at and expires_at > monotonic():
+        return True
+
+    if not _hash_executor.submit(check_password_hash, password_hash, password).result():
+        return False
+
+    if len(_password_cache) >= PASSWORD_CACHE_MAXSIZE:
+        _password_cache.clear()
+    _password_cache[key] = monotonic() + PASSWORD_CACHE_TTL
+    return True
+
+
+# Hash checked for unknown usernames so failed logins cost the same whether or not the user exists
+DUMMY_HASH = hash_password('enova-dummy-password')
+
+# MySQL error ER_DUP_ENTRY: a UNIQUE index (e.g. users.username) rejected the row
+DUPLICATE_ENTRY_ERRNO = 1062
+
+# Required form fields, extracted in one call (a missing key still raises a 400 Bad Request)
+CREDENTIAL_FIELDS = itemgetter('username', 'password')
+
+
 # --- 5. Authentication Routes ---
 @app.route('/register', methods=['GET', 'POST'])
 def register():
@@ -169,32 +601,29 @@ def register():
         return redirect(url_for('index'))
 
     if request.method == 'POST':
-        username = request.form['username'].strip()
-        password = request.form['password']
+        username, password = CREDENTIAL_FIELDS(request.form)
+        username = username.strip()
 
         if not username or not password:
             flash('Both username and password are required.', 'danger')
             return redirect(url_for('register'))
 
         try:
-            cursor = mysql.connection.cursor()
-            cursor.execute('SELECT id FROM users WHERE username = %s', (username,))
-            existing_user = cursor.fetchone()
-
-            if existing_user:
-                cursor.close()
+            hashed_password = hash_password(password)
+
+            # Single statement: the UNIQUE username index rejects duplicates, so no prior SELECT is needed
+            try:
+                with db_transaction() as cursor:
+                    cursor.execute(
+                        'INSERT INTO users (username, password_hash, role) VALUES (%s, %s, %s)',
+                        (username, hashed_password, 'user')
+                    )
+            except mysql_errors.IntegrityError as e:
+                if e.errno != DUPLICATE_ENTRY_ERRNO:
+                    raise
                 flash('That username is already taken. Please choose another.', 'danger')
                 return redirect(url_for('register'))
 
-            hashed_password = generate_password_hash(password, method='pbkdf2:sha256')
-
-            cursor.execute(
-                'INSERT INTO users (username, password_hash, role) VALUES (%s, %s, %s)',
-                (username, hashed_password, 'user')
-            )
-            mysql.connection.commit()
-            cursor.close()
-
             flash('Registration successful! You can now log in.', 'success')
             return redirect(url_for('login'))
 
@@ -210,23 +639,44 @@ def register():
 def login():
     """Handles user login."""
     if current_user.is_authenticated:
+        # Backfill the cached role for sessions created before it was stored
+        session['role'] = current_user.role
         if current_user.role == 'admin':
             return redirect(url_for('admin_dashboard'))
         return redirect(url_for('index'))
 
     if request.method == 'POST':
-        username = request.form['username']
-        password = request.form['password']
+        username, password = CREDENTIAL_FIELDS(request.form)
 
         try:
-            cursor = mysql.connection.cursor()
-            cursor.execute('SELECT id, password_hash, role FROM users WHERE username = %s', (username,))
+            cursor = get_db().cursor(dictionary=True)
+            cursor.execute('SELECT id, username, password_hash, role FROM users WHERE username = %s', (username,))
             user_data = cursor.fetchone()
             cursor.close()
 
-            if user_data and check_password_hash(user_data['password_hash'], password):
-                user = load_user(user_data['id'])
+            # Always pay the full hashing cost, checking unknown usernames against DUMMY_HASH, and
+            # combine the results without short-circuiting so response time does not reveal
+            # whether a username exists.
+            user_exists = user_data is not None
+            password_ok = verify_password(user_data['password_hash'] if user_exists else DUMMY_HASH, password)
+
+            if user_exists & password_ok:
+                # Upgrade legacy PBKDF2 (or differently tuned) hashes now that we have the plaintext password.
+                # Opportunistic: if it fails, the old hash still works, so the login goes ahead.
+                if not user_data['password_hash'].startswith(PASSWORD_HASH_METHOD + '$'):
+                    try:
+                        with db_transaction() as cursor:
+                            cursor.execute(
+                                'UPDATE users SET password_hash = %s WHERE id = %s',
+                                (hash_password(password), user_data['id'])
+                            )
+                    except Exception as e:
+                        print(f"Error upgrading password hash for user {user_data['id']}: {e}")
+
+                # Build the user from the row already in hand (and refresh the load_user cache with it)
+                user = cache_user((user_data['id'], user_data['username'], user_data['role']))
                 login_user(user)
+                session['role'] = user.role
 
                 flash('Login successful!', 'success')
 
@@ -249,21 +699,52 @@ def login():
 @login_required
 def logout():
     """Handles user logout."""
+    invalidate_cached_user(current_user.id)
     logout_user()
+    session.pop('role', None)
     flash('You have been logged out.', 'info')
     return redirect(url_for('login'))
 
 
 # --- 6. Event Management Routes (Admin & Public) ---
 
+def parse_event_schedule(date_str, time_str):
+    """Parses the event form's date ('YYYY-MM-DD') and time ('HH:MM') inputs; raises ValueError if invalid."""
+    return datetime.strptime(date_str, '%Y-%m-%d').date(), datetime.strptime(time_str[:5], '%H:%M').time()
+
+
+def format_event_schedule(date, time):
+    """
+    Converts an event's DATE/TIME column values (a date and a timedelta) back to the
+    'YYYY-MM-DD' and 'HH:MM' strings that templates and the JSON API display.
+    """
+    minutes = int(time.total_seconds()) // 60
+    return date.isoformat(), f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+
+@cache.memoize(timeout=PAGE_CACHE_TIMEOUT)
+def load_event(data_version, event_id):
+    """
+    Returns one event row, or None if it does not exist.
+    Memoized per data version (every event write bumps it); raises on database errors so that
+    failures are never cached. A missing event (None) is not cached either.
+    """
+    cursor = get_db().cursor(dictionary=True)
+    cursor.execute(
+        'SELECT id, title, date, time, location, description, price FROM events WHERE id = %s',
+        (event_id,)
+    )
+    event = cursor.fetchone()
+    cursor.close()
+    if event is not None:
+        event['date'], event['time'] = format_event_schedule(event['date'], event['time'])
+    return event
+
+
 def get_event_by_id(event_id):
     """Fetches a single event by ID."""
     try:
-        cursor = mysql.connection.cursor()
-        cursor.execute('SELECT * FROM events WHERE id = %s', (event_id,))
-        event = cursor.fetchone()
-        cursor.close()
-        return event
+        return load_event(get_data_version(), event_id)
     except Exception as e:
         print(f"Error fetching event ID {event_id}: {e}")
         return None
@@ -275,10 +756,11 @@ def get_booking_by_id(booking_id):
     Used for the view_receipt placeholder.
     """
     try:
-        cursor = mysql.connection.cursor()
+        cursor = get_db().cursor(dictionary=True)
         query = """
         SELECT 
-            b.*, 
+            b.id, b.user_id, b.event_type, b.event_package, b.preferred_dates, b.guest_count,
+            b.budget, b.base_price, b.addon_total, b.total_estimated, b.vision, b.status,
             u.username AS client_username 
         FROM bookings b
         JOIN users u ON b.user_id = u.id
@@ -302,61 +784,173 @@ def get_event_booking_stats(event_id):
         'Rejected': 0,
     }
     try:
-        cursor = mysql.connection.cursor()
-        event_title = None
-        cursor.execute('SELECT title FROM events WHERE id = %s', (event_id,))
-        event_data = cursor.fetchone()
-
-        if not event_data:
-            cursor.close()
-            return stats
-
-        event_title = event_data['title']
+        cursor = get_db().cursor()
 
+        # Bookings carry the event's integer ID, so this is a single range read on idx_bookings_event_id
         query = """
         SELECT status, COUNT(id) AS count
         FROM bookings
-        WHERE event_type = %s
+        WHERE event_id = %s
         GROUP BY status
         """
-        cursor.execute(query, (event_title,))
+        cursor.execute(query, (event_id,))
         results = cursor.fetchall()
+        cursor.close()
 
         total = 0
-        for row in results:
-            status = row['status']
-            count = row['count']
+        for status, count in results:
             if status in stats:
                 stats[status] = count
             total += count
         stats['total'] = total
 
-        cursor.close()
         return stats
     except Exception as e:
         print(f"Error fetching event booking stats for event ID {event_id}: {e}")
         return stats
 
 
+# Lightweight row type for the event list; column order matches the SELECT in index()
+EventListItem = namedtuple('EventListItem', 'id title date time location')
+
+EVENTS_PER_PAGE = 20
+MAX_EVENTS_PER_PAGE = 100
+
+
+@cache.memoize(timeout=PAGE_CACHE_TIMEOUT)
+def load_event_page(data_version, page, per_page):
+    """
+    Returns (events, has_next) for one page of the event list.
+    Memoized per data version; raises on database errors so that failures are never cached.
+    """
+    # Plain tuple cursor: rows are wrapped in EventListItem, skipping per-row dict construction
+    cursor = get_db().cursor()
+    # Ordering by date and time (read in order from idx_events_date_time) to show upcoming events first.
+    # The list only renders these columns; description is loaded on the detail page.
+    # One extra row is fetched to tell whether a next page exists.
+    cursor.execute(
+        'SELECT id, title, date, time, location FROM events ORDER BY date ASC, time ASC LIMIT %s OFFSET %s',
+        (per_page + 1, (page - 1) * per_page)
+    )
+    events = [
+        EventListItem(event_id, title, *format_event_schedule(date, time), location)
+        for event_id, title, date, time, location in cursor
+    ]
+    cursor.close()
+    return events[:per_page], len(events) > per_page
+
+
 @app.route('/')
 @login_required
 def index():
-    """Main dashboard showing the list of scheduled events, or redirects admin."""
+    """Main dashboard showing one page (?page=, ?per_page=) of scheduled events, or redirects admin."""
     if current_user.role == 'admin':
         return redirect(url_for('admin_dashboard'))
 
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = min(max(request.args.get('per_page', EVENTS_PER_PAGE, type=int), 1), MAX_EVENTS_PER_PAGE)
+
+    data_version = get_data_version()
+    etag = f'index-{CODE_RELEASE}-{current_user.id}-{data_version}-{page}-{per_page}'
+    unchanged = not_modified(etag)
+    if unchanged:
+        return unchanged
+
     events = []
+    has_next = False
     try:
-        cursor = mysql.connection.cursor()
-        # Ordering by date and time (as strings) to show upcoming events first
-        cursor.execute('SELECT * FROM events ORDER BY date ASC, time ASC')
-        events = cursor.fetchall()
-        cursor.close()
+        events, has_next = load_event_page(data_version, page, per_page)
     except Exception as e:
         flash('Could not load events. Database connection failed.', 'danger')
         print(f"Error loading events for index: {e}")
 
-    return render_template('index.html', events=events)
+    return render_tagged(etag, 'index.html', events=events, page=page, per_page=per_page, has_next=has_next)
+
+
+DASHBOARD_EVENTS_LIMIT = 25
+
+
+@lru_cache(maxsize=1)
+def _format_today(epoch_minute):
+    return datetime.now().strftime('%Y-%m-%d')
+
+
+def get_today_str():
+    """Returns today's date as 'YYYY-MM-DD', formatted at most once a minute rather than per request."""
+    return _format_today(int(unix_time()) // 60)
+
+
+@cache.memoize(timeout=PAGE_CACHE_TIMEOUT)
+def load_admin_dashboard_data(data_version, today_str):
+    """
+    Runs the admin dashboard queries and returns (stats, events, recent_bookings).
+    Memoized per data version, so repeat dashboard loads skip MySQL until the next write.
+    Raises on database errors so that failures are never cached.
+    """
+    stats = {
+        'total_bookings': 0,
+        'pending_bookings': 0,
+        'upcoming_events': 0,
+        'total_users': 0
+    }
+
+    cursor = get_db().cursor(dictionary=True)
+
+    # 1. Fetch Summary Stats in one round-trip
+    # Both booking counts come from a single scan of the bookings table
+    query_stats = """
+    SELECT
+        b.total_bookings,
+        b.pending_bookings,
+        (SELECT COUNT(id) FROM events WHERE date >= %s) AS upcoming_events,
+        (SELECT COUNT(id) FROM users) AS total_users
+    FROM (
+        SELECT COUNT(id) AS total_bookings, COUNT(CASE WHEN status = 'Pending' THEN 1 END) AS pending_bookings
+        FROM bookings
+    ) b
+    """
+    cursor.execute(query_stats, (today_str,))
+    stats.update(cursor.fetchone())
+
+    # 2. Fetch Upcoming Events (NEW: For the internal schedule table)
+    # Only the next few from today on: a range read on idx_events_date_time instead of the full history
+    query_events = """
+    SELECT id, title, date, time, location, price
+    FROM events
+    WHERE date >= %s
+    ORDER BY date ASC, time ASC
+    LIMIT %s
+    """
+    cursor.execute(query_events, (today_str, DASHBOARD_EVENTS_LIMIT))
+    events = cursor.fetchall()
+    for event in events:
+        event['date'], event['time'] = format_event_schedule(event['date'], event['time'])
+
+    # 3. Fetch Recent Bookings (UPDATED: Added pricing fields)
+    query_bookings = """
+    SELECT 
+        b.id, 
+        u.username AS client_username, 
+        b.event_type, 
+        b.event_package,
+        b.preferred_dates, 
+        b.status,
+        b.base_price,        
+        b.addon_total,       
+        b.total_estimated    
+    FROM 
+        bookings b
+    JOIN 
+        users u ON b.user_id = u.id 
+    ORDER BY 
+        b.id DESC
+    LIMIT 10;
+    """
+    cursor.execute(query_bookings)
+    recent_bookings = cursor.fetchall()
+
+    cursor.close()
+    return stats, events, recent_bookings
 
 
 @app.route('/admin_dashboard')
@@ -377,59 +971,23 @@ def admin_dashboard():
     events = []  # NEW: Events list for the schedule table
 
     # Get today's date string for comparison
-    today_str = datetime.now().strftime('%Y-%m-%d')
-
-    try:
-        cursor = mysql.connection.cursor()
-
-        # 1. Fetch Summary Stats (Existing Logic)
-        cursor.execute('SELECT COUNT(id) AS total FROM bookings')
-        stats['total_bookings'] = cursor.fetchone()['total']
-
-        cursor.execute("SELECT COUNT(id) AS pending_count FROM bookings WHERE status = 'Pending'")
-        stats['pending_bookings'] = cursor.fetchone()['pending_count']
-
-        cursor.execute("SELECT COUNT(id) AS upcoming_count FROM events WHERE date >= %s", (today_str,))
-        stats['upcoming_events'] = cursor.fetchone()['upcoming_count']
-
-        cursor.execute('SELECT COUNT(id) AS user_count FROM users')
-        stats['total_users'] = cursor.fetchone()['user_count']
+    today_str = get_today_str()
 
-        # 2. Fetch Upcoming Events (NEW: For the internal schedule table)
-        query_events = "SELECT id, title, date, time, location, price FROM events ORDER BY date ASC, time ASC"
-        cursor.execute(query_events)
-        events = cursor.fetchall()
+    data_version = get_data_version()
+    etag = f"admin-{CODE_RELEASE}-{session['_user_id']}-{data_version}-{today_str}"
+    unchanged = not_modified(etag)
+    if unchanged:
+        return unchanged
 
-        # 3. Fetch Recent Bookings (UPDATED: Added pricing fields)
-        query_bookings = """
-        SELECT 
-            b.id, 
-            u.username AS client_username, 
-            b.event_type, 
-            b.event_package,
-            b.preferred_dates, 
-            b.status,
-            b.base_price,        
-            b.addon_total,       
-            b.total_estimated    
-        FROM 
-            bookings b
-        JOIN 
-            users u ON b.user_id = u.id 
-        ORDER BY 
-            b.id DESC
-        LIMIT 10;
-        """
-        cursor.execute(query_bookings)
-        recent_bookings = cursor.fetchall()
-
-        cursor.close()
+    try:
+        stats, events, recent_bookings = load_admin_dashboard_data(data_version, today_str)
     except Exception as e:
         flash('Could not load dashboard statistics or recent bookings. Database connection failed.', 'danger')
         print(f"Error loading admin dashboard data: {e}")
 
     # Pass the stats, events, AND the recent_bookings list (renamed to 'bookings' for the template)
-    return render_template(
+    return render_tagged(
+        etag,
         'admin_dashboard.html',
         stats=stats,
         events=events,
@@ -437,15 +995,46 @@ def admin_dashboard():
     )
 
 
+@app.route('/api/admin_dashboard')
+@admin_required
+def admin_dashboard_api():
+    """
+    JSON version of the admin dashboard data for client-side rendering.
+    Tagged with the data version (with a shared cache), so an unchanged dashboard is answered with an empty 304.
+    """
+    today_str = get_today_str()
+    data_version = get_data_version()
+
+    try:
+        stats, events, recent_bookings = load_admin_dashboard_data(data_version, today_str)
+    except Exception as e:
+        print(f"Error loading admin dashboard API data: {e}")
+        return jsonify(error='Could not load dashboard data. Database connection failed.'), 503
+
+    response = jsonify(stats=stats, events=events, bookings=recent_bookings)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    if not SHARED_CACHE:
+        return response  # Without a shared version counter the tag could miss other workers' writes
+    response.set_etag(f'{CODE_RELEASE}-{data_version}-{today_str}')
+    return response.make_conditional(request)
+
+
+ADMIN_BOOKINGS_PER_PAGE = 50
+
+
 @app.route('/admin/bookings')
 @admin_required
 def admin_bookings():
-    """Admin route to view all submitted booking requests with user details."""
+    """Admin route to view submitted booking requests with user details, one page (?page=) at a time."""
+    page = max(request.args.get('page', 1, type=int), 1)
     bookings = []
+    has_next = False
     try:
-        cursor = mysql.connection.cursor()
+        cursor = get_db().cursor(dictionary=True)
 
-        # Join to fetch booking details, username, package, and pricing
+        # Join to fetch booking details, username, package, and pricing.
+        # One extra row is fetched to tell whether a next page exists.
         query = """
         SELECT 
             b.id, b.event_type, b.event_package, b.preferred_dates, b.guest_count, 
@@ -454,20 +1043,20 @@ def admin_bookings():
         FROM bookings b
         JOIN users u ON b.user_id = u.id
         ORDER BY 
-            CASE b.status
-                WHEN 'Pending' THEN 1  -- Put pending first
-                ELSE 2
-            END,
-            b.id DESC  -- Then order by newest ID
+            b.is_pending DESC,  -- Put pending first
+            b.id DESC  -- Then order by newest ID (both read in order from idx_bookings_pending_id)
+        LIMIT %s OFFSET %s
         """
-        cursor.execute(query)
+        cursor.execute(query, (ADMIN_BOOKINGS_PER_PAGE + 1, (page - 1) * ADMIN_BOOKINGS_PER_PAGE))
         bookings = cursor.fetchall()
         cursor.close()
+        has_next = len(bookings) > ADMIN_BOOKINGS_PER_PAGE
+        bookings = bookings[:ADMIN_BOOKINGS_PER_PAGE]
     except Exception as e:
         flash('Could not load bookings. Database connection failed.', 'danger')
         print(f"Error loading admin bookings: {e}")
 
-    return render_template('admin_bookings.html', bookings=bookings)
+    return render_template('admin_bookings.html', bookings=bookings, page=page, has_next=has_next)
 
 
 @app.route('/admin/booking/update/<int:booking_id>', methods=['POST'])
@@ -483,10 +1072,8 @@ def update_booking_status(booking_id):
         return redirect(url_for('admin_bookings'))
 
     try:
-        cur = mysql.connection.cursor()
-        cur.execute("UPDATE bookings SET status = %s WHERE id = %s", (new_status, booking_id))
-        mysql.connection.commit()
-        cur.close()
+        with db_transaction() as cur:
+            cur.execute("UPDATE bookings SET status = %s WHERE id = %s", (new_status, booking_id))
         flash(f'Booking {booking_id} status updated to {new_status}.', 'success')
     except Exception as e:
         flash('Could not update booking status.', 'danger')
@@ -510,6 +1097,10 @@ def event_detail(event_id):
     return render_template('event_detail.html', event=event, stats=stats)
 
 
+ADD_EVENT_FIELDS = itemgetter('event_title', 'event_date', 'event_time', 'event_location')
+EDIT_EVENT_FIELDS = itemgetter('title', 'date', 'time', 'location')
+
+
 @app.route('/add_event', methods=('POST',))
 @admin_required
 def add_event():
@@ -520,12 +1111,10 @@ def add_event():
     """
 
     # Fetching field names from the updated dashboard form
-    title = request.form['event_title']
-    date = request.form['event_date']
-    time = request.form['event_time']
-    location = request.form['event_location']
-    description = request.form.get('event_description', '')
-    price_str = request.form.get('event_price', '0.00')
+    form = request.form
+    title, date, time, location = ADD_EVENT_FIELDS(form)
+    description = form.get('event_description', '')
+    price_str = form.get('event_price', '0.00')
 
     try:
         price = float(price_str)
@@ -538,14 +1127,18 @@ def add_event():
         return redirect(url_for('admin_dashboard'))
 
     try:
-        cursor = mysql.connection.cursor()
-        cursor.execute(
-            # UPDATED: Added price field
-            'INSERT INTO events (title, date, time, location, description, price) VALUES (%s, %s, %s, %s, %s, %s)',
-            (title, date, time, location, description, price)
-        )
-        mysql.connection.commit()
-        cursor.close()
+        date, time = parse_event_schedule(date, time)
+    except ValueError:
+        flash('Invalid date or time for the event.', 'danger')
+        return redirect(url_for('admin_dashboard'))
+
+    try:
+        with db_transaction() as cursor:
+            cursor.execute(
+                # UPDATED: Added price field
+                'INSERT INTO events (title, date, time, location, description, price) VALUES (%s, %s, %s, %s, %s, %s)',
+                (title, date, time, location, description, price)
+            )
         flash('Event added successfully!', 'success')
     except Exception as e:
         flash('Could not add event. Database connection failed.', 'danger')
@@ -564,12 +1157,10 @@ def edit_event(event_id):
         return redirect(url_for('index'))
 
     if request.method == 'POST':
-        title = request.form['title']
-        date = request.form['date']
-        time = request.form['time']
-        location = request.form['location']
-        description = request.form.get('description', '')
-        price_str = request.form.get('price', '0.00')  # NEW: Fetch price
+        form = request.form
+        title, date, time, location = EDIT_EVENT_FIELDS(form)
+        description = form.get('description', '')
+        price_str = form.get('price', '0.00')  # NEW: Fetch price
 
         try:
             price = float(price_str)
@@ -582,14 +1173,18 @@ def edit_event(event_id):
             return redirect(url_for('edit_event', event_id=event_id))
 
         try:
-            cursor = mysql.connection.cursor()
-            # UPDATED: Added price field
-            cursor.execute(
-                'UPDATE events SET title = %s, date = %s, time = %s, location = %s, description = %s, price = %s WHERE id = %s',
-                (title, date, time, location, description, price, event_id)
-            )
-            mysql.connection.commit()
-            cursor.close()
+            date, time = parse_event_schedule(date, time)
+        except ValueError:
+            flash('Invalid date or time for the event.', 'danger')
+            return redirect(url_for('edit_event', event_id=event_id))
+
+        try:
+            with db_transaction() as cursor:
+                # UPDATED: Added price field
+                cursor.execute(
+                    'UPDATE events SET title = %s, date = %s, time = %s, location = %s, description = %s, price = %s WHERE id = %s',
+                    (title, date, time, location, description, price, event_id)
+                )
             flash('Event updated successfully!', 'success')
         except Exception as e:
             flash('Could not update event. Database connection failed.', 'danger')
@@ -605,10 +1200,8 @@ def edit_event(event_id):
 def delete_event(event_id):
     """Handles deleting an event (Admin only)."""
     try:
-        cursor = mysql.connection.cursor()
-        cursor.execute('DELETE FROM events WHERE id = %s', (event_id,))
-        mysql.connection.commit()
-        cursor.close()
+        with db_transaction() as cursor:
+            cursor.execute('DELETE FROM events WHERE id = %s', (event_id,))
         flash('Event deleted successfully!', 'success')
     except Exception as e:
         flash('Could not delete event. Database connection failed.', 'danger')
@@ -677,54 +1270,55 @@ def contact():
     return render_template('contact.html')
 
 
+# Event-specific booking form fields folded into the vision text as (label, form key).
+# Note: These keys must match the form fields in your 'booking.html'
+DYNAMIC_FIELDS = (
+    ("Age", 'birthday_age'),
+    ("Theme", 'birthday_theme'),
+    ("Cake", 'birthday_cake'),
+
+    ("Venue Type", 'wedding_venue_type'),
+    ("Ideal Month", 'wedding_months'),
+
+    ("Goal", 'gala_purpose'),
+    ("Dress Code", 'gala_dress_code'),
+
+    ("Product", 'product_name'),
+    ("Audience", 'launch_audience'),
+
+    ("Other Details", 'other_details'),
+)
+
+
 @app.route('/booking', methods=['GET', 'POST'])
 @login_required
 def booking():
     """Renders the Booking page and handles form submissions (POST)."""
     if request.method == 'POST':
         user_id = current_user.id
-        event_type = request.form.get('event_type')
-        event_package = request.form.get('event_package')
-        preferred_dates = request.form.get('preferred_dates')
-        guest_count = request.form.get('guest_count')
+        form = request.form
+        event_type = form.get('event_type')
+        event_package = form.get('event_package')
+        preferred_dates = form.get('preferred_dates')
+        guest_count = form.get('guest_count')
 
         # --- Pricing Fields (These come from hidden/calculated fields in the booking form) ---
-        base_price = request.form.get('base_price_hidden', 0)
-        addon_total = request.form.get('addon_total_hidden', 0)
-
-        try:
-            total_estimated = float(base_price) + float(addon_total)
-        except ValueError:
-            total_estimated = 0.0
+        # total_estimated is a generated column: MySQL stores base_price + addon_total itself.
+        base_price = form.get('base_price_hidden', 0)
+        addon_total = form.get('addon_total_hidden', 0)
         # --- End Pricing Fields ---
 
         budget = None  # Assuming this is not used/set in the form anymore
-        base_vision = request.form.get('vision')
+        base_vision = form.get('vision')
 
         # --- Handle Dynamic Fields and combine into vision ---
-        dynamic_details = []
-
-        # Helper to safely append details
-        def add_detail(label, key):
-            value = request.form.get(key)
-            if value and value.strip():
-                dynamic_details.append(f"{label}: {value}")
-
-        # Note: These keys must match the form fields in your 'booking.html'
-        add_detail("Age", 'birthday_age')
-        add_detail("Theme", 'birthday_theme')
-        add_detail("Cake", 'birthday_cake')
-
-        add_detail("Venue Type", 'wedding_venue_type')
-        add_detail("Ideal Month", 'wedding_months')
-
-        add_detail("Goal", 'gala_purpose')
-        add_detail("Dress Code", 'gala_dress_code')
-
-        add_detail("Product", 'product_name')
-        add_detail("Audience", 'launch_audience')
-
-        add_detail("Other Details", 'other_details')
+        # One pass over the filled-in event-specific fields (blank or whitespace-only ones are skipped)
+        dynamic_details = [
+            f"{label}: {value}"
+            for label, key in DYNAMIC_FIELDS
+            for value in (form.get(key),)
+            if value and value.strip()
+        ]
 
         # Combine base vision and dynamic details
         full_vision_list = []
@@ -741,18 +1335,16 @@ def booking():
 
         # Save to database (using MySQL)
         try:
-            cursor = mysql.connection.cursor()
-            cursor.execute(
-                """
-                INSERT INTO bookings 
-                (user_id, event_type, event_package, preferred_dates, guest_count, budget, base_price, addon_total, total_estimated, vision) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (user_id, event_type, event_package, preferred_dates, guest_count, budget, base_price, addon_total,
-                 total_estimated, final_vision)
-            )
-            mysql.connection.commit()
-            cursor.close()
+            with db_transaction() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO bookings 
+                    (user_id, event_type, event_package, preferred_dates, guest_count, budget, base_price, addon_total, vision, event_id) 
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, (SELECT id FROM events WHERE title = %s ORDER BY id LIMIT 1))
+                    """,
+                    (user_id, event_type, event_package, preferred_dates, guest_count, budget, base_price, addon_total,
+                     final_vision, event_type)
+                )
 
             flash('Your booking request has been submitted successfully! We will contact you soon.', 'success')
             return redirect(url_for('index'))
@@ -768,7 +1360,25 @@ def booking():
     return render_template('booking.html')
 
 
+# --- Optional Request Monitoring ---
+# Per-endpoint latency histograms and outlier profiles, for finding the real hotspots.
+# Opt-in because the profiler adds overhead to every request; settings live in monitoring.cfg.
+if os.environ.get('ENOVA_MONITORING') == '1':
+    import flask_monitoringdashboard as monitoring_dashboard
+
+    monitoring_dashboard.config.init_from(file=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'monitoring.cfg'))
+    monitoring_dashboard.bind(app)
+
+
 # --- 8. Run Server ---
+# Development only. In production serve the app with multiple workers instead:
+#     gunicorn -c gunicorn_conf.py app:app
 if __name__ == '__main__':
     print(f"Flask app configured to use MySQL database: {app.config['MYSQL_DB']} at {app.config['MYSQL_HOST']}")
-    app.run(debug=True)
\ No newline at end of file
+    if not DEBUG_MODE:
+        print("Running the single-process dev server without the debugger; set FLASK_DEBUG=1 for development "
+              "or use 'gunicorn -c gunicorn_conf.py app:app' in production.")
+    # The stat-polling reloader is off by default; restart on change with an inotify-based watcher instead:
+    #     watchmedo auto-restart -p '*.py;*.html' -R -- python app.py
+    # or opt back in with FLASK_USE_RELOADER=1.
+    app.run(debug=DEBUG_MODE, use_reloader=os.environ.get('FLASK_USE_RELOADER', '0') == '1')
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+Gunicorn settings for running the app in production:
+
+    gunicorn -c gunicorn_conf.py app:app
+"""
+import multiprocessing
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Classic sizing: (2 x CPU cores) + 1 worker processes
+workers = multiprocessing.cpu_count() * 2 + 1
+
+# Threaded workers: one request per thread, each holding at most one pooled MySQL connection.
+# gevent is not used: a gevent worker accepts far more concurrent requests than the pool
+# (at most 32 connections) can serve, so most of them would just queue in get_db().
+worker_class = 'gthread'
+threads = 4
+
+# Pool sizing: pool_size = threads per process x DB connections held per request, with 2x
+# headroom for connections checked out outside a request (e.g. init_db). mysql-connector
+# caps a pool at 32. Make sure MySQL's max_connections >= workers x pool size.
+DB_CONNECTIONS_PER_REQUEST = 1
+raw_env = [f'MYSQL_POOL_SIZE={min(threads * DB_CONNECTIONS_PER_REQUEST * 2, 32)}']
+
+# Page-data caching and ETags are only enabled with REDIS_URL set, so that every worker
+# shares one cache; without it each request reads MySQL directly.
+
+# Do not preload: the pool is created lazily and must not be shared across forked workers.
+preload_app = False
+
+timeout = 30
+keepalive = 5